@@ -7,6 +7,7 @@ import random
 from fpdf import FPDF
 import json
 import base64
+from detection import detect_waste_risk
 
 # --- 1. Page Configuration ---
 st.set_page_config(
@@ -290,6 +291,8 @@ def analyze_internal_data(api_key, df):
         qty_col = next((cols_map[c] for c in ['qty sold', 'qty', 'quantity', 'sold', 'orders'] if c in cols_map), None)
         # Heuristics for Time
         time_col = next((cols_map[c] for c in ['time', 'hour'] if c in cols_map), None)
+        # Heuristics for Date (for time series detection)
+        date_col = next((cols_map[c] for c in ['date', 'day', 'order date'] if c in cols_map), None)
         # Heuristics for Cost/Price (for margin)
         cost_col = next((cols_map[c] for c in ['unit cost', 'cost', 'cogs'] if c in cols_map), None)
         price_col = next((cols_map[c] for c in ['unit price', 'price', 'revenue'] if c in cols_map), None)
@@ -299,7 +302,6 @@ def analyze_internal_data(api_key, df):
             item_sales = df.groupby(item_col)[qty_col].sum().sort_values(ascending=False)
             
             top_3 = item_sales.head(3).to_dict()
-            bottom_3 = item_sales.tail(3).to_dict()
             total_items_sold = item_sales.sum()
             
             peak_time = "N/A"
@@ -317,10 +319,19 @@ def analyze_internal_data(api_key, df):
                     margin_note = f"Top Item '{top_item}' has approx margin of €{margin:.2f}"
                 except: pass
 
+            # Dead stock: anomaly detection if we have dates, else fall back to lowest totals
+            flagged = detect_waste_risk(df, item_col, qty_col, date_col) if date_col else None
+            if flagged is None:
+                dead_stock = f"Trend detection unavailable (no usable dates or under 14 days); lowest totals: {item_sales.tail(3).to_dict()}"
+            elif flagged.empty:
+                dead_stock = "No sudden drops detected."
+            else:
+                dead_stock = "\n" + flagged.to_csv()
+
             data_summary = f"""
             REAL METRICS FOR OPTIMIZATION:
             - Top 3 (High Demand): {top_3}
-            - Bottom 3 (Dead Stock Risk): {bottom_3}
+            - Dead Stock Risk (7-day velocity, day/week deltas, z-score vs own history): {dead_stock}
             - Total Volume: {total_items_sold}
             - Peak Order Time: {peak_time}
             - Financial Context: {margin_note}
@@ -0,0 +1,92 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def parse_dates(col):
+    # ISO first (fast, vectorized). Otherwise pick ONE of day-first / month-first for the
+    # whole column, so DD/MM files (Barcelona) aren't silently mixed with MM/DD.
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col
+    dates = pd.to_datetime(col, format='ISO8601', errors='coerce')
+    if dates.notna().mean() > 0.5:
+        return dates
+    with warnings.catch_warnings():
+        # Unrecognised formats fall back to per-cell dateutil with a UserWarning; bad cells -> NaT
+        warnings.simplefilter('ignore', UserWarning)
+        day_first = pd.to_datetime(col, dayfirst=True, errors='coerce')
+        month_first = pd.to_datetime(col, dayfirst=False, errors='coerce')
+    n_day, n_month = day_first.notna().sum(), month_first.notna().sum()
+    if n_day == n_month and not day_first.equals(month_first):
+        # Every date fits both orders (all days <= 12): can't tell which is right
+        return pd.Series(pd.NaT, index=col.index)
+    dates = day_first if n_day >= n_month else month_first
+    if dates.notna().mean() <= 0.5:
+        return pd.Series(pd.NaT, index=col.index)
+    return dates
+
+
+def detect_waste_risk(df, item_col, qty_col, date_col, window=7, baseline_weeks=6,
+                      z_threshold=-3.0, max_items=5):
+    # Local detection stage: one vectorized pass over the POS frame (days x items matrix)
+    # so only genuinely declining items are sent to the LLM, not the raw lowest totals.
+    # Returns None when the file can't be evaluated (no usable dates / too little history),
+    # otherwise a (possibly empty) frame of flagged items.
+    dates = parse_dates(df[date_col]).dt.normalize()
+    qty = pd.to_numeric(df[qty_col], errors='coerce')
+    # Drop unparseable quantities rather than letting the sum treat them as 0 sales
+    daily = (
+        pd.DataFrame({'date': dates, 'item': df[item_col], 'qty': qty})
+        .dropna()
+        .pivot_table(index='date', columns='item', values='qty', aggfunc='sum')
+    )
+    if daily.empty:
+        return None
+
+    # Fill missing days with 0 sales, but only after each item's first sale (launch)
+    daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max(), freq='D'))
+    logged = daily.notna()
+    launched = logged.cummax()
+    daily = daily.fillna(0).where(launched)
+
+    # Need a full recent window plus at least one week of baseline before it
+    if len(daily) < 2 * window:
+        return None
+
+    # Bounded trailing baseline: seasonal items are compared to recent weeks, not all-time
+    baseline_days = baseline_weeks * 7
+    recent = daily.iloc[-window:]
+    baseline = daily.iloc[-window - baseline_days:-window]
+    prev_week = daily.iloc[-2 * window:-window]
+
+    base_mean = baseline.mean()
+    recent_mean = recent.mean()
+    # Floor the daily spread at Poisson sqrt(mean) so steady baselines still score,
+    # then scale to the spread of a window-day mean
+    base_std = np.maximum(baseline.std().fillna(0), np.sqrt(base_mean))
+    std_err = base_std / np.sqrt(window)
+
+    stats = pd.DataFrame({
+        'velocity_7d': recent_mean,
+        'baseline_avg': base_mean,
+        'dod_delta': daily.iloc[-1] - daily.iloc[-2],
+        'wow_pct': (recent.sum() - prev_week.sum()) / prev_week.sum().replace(0, np.nan) * 100,
+        'z_score': (recent_mean - base_mean) / std_err.replace(0, np.nan),
+        # Days of history in the baseline (skips new items)
+        'history_days': launched.iloc[-window - baseline_days:-window].sum(),
+    })
+
+    # Skip new items, and delisted items with no POS rows since before the baseline
+    active = logged.iloc[-window - baseline_days:].any()
+    eligible = (stats['history_days'] >= window) & active
+    # Flag sudden drops against the item's own history; items still logged but with no
+    # sales at all have no spread (NaN score) and are ranked after real drops
+    no_sales = (base_mean == 0) & (recent_mean == 0)
+    flagged = stats[eligible & ((stats['z_score'] <= z_threshold) | no_sales)]
+    return (
+        flagged.sort_values('z_score', na_position='last')
+        .head(max_items)
+        .drop(columns='history_days')
+        .round(2)
+    )
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from detection import detect_waste_risk
+
+
+def make_pos(series_by_item, start='2025-01-01', fmt='%Y-%m-%d'):
+    # Build a long POS frame from {item: [daily qty, ...]}; None = no row that day
+    rows = []
+    for item, qtys in series_by_item.items():
+        for i, q in enumerate(qtys):
+            if q is not None:
+                rows.append({'Date': (pd.Timestamp(start) + pd.Timedelta(days=i)).strftime(fmt),
+                             'Item': item, 'Quantity': q})
+    return pd.DataFrame(rows)
+
+
+def poisson(lam, days, seed=0):
+    return list(np.random.default_rng(seed).poisson(lam, days))
+
+
+def test_low_volume_drop_to_zero_is_flagged():
+    df = make_pos({
+        'Dessert': poisson(4, 35) + [0] * 7,
+        'Birria Taco': poisson(80, 42, seed=1),
+    })
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert list(flagged.index) == ['Dessert']
+
+
+def test_steady_baseline_then_drop_is_flagged():
+    df = make_pos({'Nachos Pikio': [5] * 35 + [0] * 7})
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert 'Nachos Pikio' in flagged.index
+
+
+def test_never_selling_item_is_flagged():
+    df = make_pos({'Tostada de Setas': [0] * 42, 'Birria Taco': poisson(80, 42)})
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert list(flagged.index) == ['Tostada de Setas']
+
+
+def test_new_launch_is_skipped():
+    df = make_pos({
+        'Quesadilla Beef': [None] * 38 + [20, 0, 0, 0],
+        'Birria Taco': poisson(80, 42),
+    })
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert flagged.empty
+
+
+def test_seasonal_item_uses_bounded_baseline():
+    # Sold heavily last year, low but steady for the recent baseline weeks
+    df = make_pos({'Alambre Veggie': poisson(60, 300) + poisson(3, 56, seed=2)})
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert flagged.empty
+
+
+def test_short_history_cannot_be_evaluated():
+    df = make_pos({'Carnitas Taco': [10] * 10})
+    assert detect_waste_risk(df, 'Item', 'Quantity', 'Date') is None
+
+
+def test_unparseable_dates_cannot_be_evaluated():
+    df = pd.DataFrame({'Day': ['Monday', 'Tuesday'] * 10, 'Item': 'Carnitas Taco', 'Quantity': 10})
+    assert detect_waste_risk(df, 'Item', 'Quantity', 'Day') is None
+
+
+def test_real_drop_ranks_ahead_of_stale_zero_items():
+    stale = {f'Old {i}': [3] * 20 + [0] * 80 for i in range(5)}
+    df = make_pos({**stale, 'Birria Taco': poisson(30, 93) + [0] * 7})
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert flagged.index[0] == 'Birria Taco'
+
+
+def test_delisted_item_is_skipped():
+    df = make_pos({
+        'Tostada de Setas': [3] * 20 + [None] * 80,
+        'Birria Taco': poisson(30, 100),
+    })
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert flagged.empty
+
+
+def test_day_first_dates_keep_timeline():
+    df = make_pos({'Dessert': poisson(4, 35) + [0] * 7}, start='2025-01-10', fmt='%d/%m/%Y')
+    flagged = detect_waste_risk(df, 'Item', 'Quantity', 'Date')
+    assert list(flagged.index) == ['Dessert']
+
+
+def test_ambiguous_dates_cannot_be_evaluated():
+    # Every day <= 12, so DD/MM and MM/DD both parse
+    df = make_pos({'Dessert': [4] * 12}, start='2025-03-01', fmt='%d/%m/%Y')
+    df = pd.concat([df, make_pos({'Dessert': [4] * 12}, start='2025-04-01', fmt='%d/%m/%Y')])
+    assert detect_waste_risk(df, 'Item', 'Quantity', 'Date') is None
+
+
+def test_unparseable_quantities_cannot_be_evaluated():
+    df = make_pos({'Carnitas Taco': ['n/a'] * 20})
+    assert detect_waste_risk(df, 'Item', 'Quantity', 'Date') is None